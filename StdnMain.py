@@ -1,4 +1,8 @@
 import sqlite3
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
 from sqlite3 import Error
 import customtkinter as ctk
 from tkinter import ttk, messagebox
@@ -9,6 +13,13 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 # Database setup
 DATABASE_NAME = "student_management.db"
 
+# Password hashing settings
+SALT_SIZE = 16
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+PBKDF2_ITERATIONS = 600000
+
 # CustomTkinter appearance settings
 ctk.set_appearance_mode("System")  # Modes: "System", "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
@@ -103,15 +114,124 @@ def create_tables(conn):
     except Error as e:
         print(f"Error creating tables: {e}")
 
+# Logged-in user
+class User:
+    """Profile of an authenticated user, loaded once at login."""
+    __slots__ = ("id", "username", "name", "email", "role")
+
+    def __init__(self, id, username, name, email, role):
+        self.id = id
+        self.username = username
+        self.name = name
+        self.email = email
+        self.role = role
+
+    @property
+    def is_teacher(self):
+        return self.role == "teacher"
+
+# Hash a password
+def hash_password(password):
+    """Return a salted hash of the password, encoded with its parameters."""
+    salt = os.urandom(SALT_SIZE)
+    if hasattr(hashlib, "scrypt"):
+        digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+# Parse a stored hash
+def parse_hash(stored_hash):
+    """Split a hash from hash_password into (scheme, params, salt, digest), or None if malformed."""
+    if not isinstance(stored_hash, str):
+        return None
+    scheme, *fields = stored_hash.split("$")
+    if scheme == "scrypt" and len(fields) == 5:
+        *params, salt, digest = fields
+    elif scheme == "pbkdf2_sha256" and len(fields) == 3:
+        *params, salt, digest = fields
+    else:
+        return None
+    if not all(param.isdecimal() and int(param) > 0 for param in params):
+        return None
+    try:
+        salt, digest = bytes.fromhex(salt), bytes.fromhex(digest)
+    except ValueError:
+        return None
+    if not salt or not digest:
+        return None
+    return scheme, [int(param) for param in params], salt, digest
+
+# Verify a password
+def verify_password(password, stored_hash):
+    """Check a password against a hash produced by hash_password."""
+    parsed = parse_hash(stored_hash)
+    if parsed is None:
+        return False
+    scheme, params, salt, expected = parsed
+    try:
+        if scheme == "scrypt":
+            n, r, p = params
+            digest = hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=len(expected))
+        else:
+            iterations, = params
+            digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations, dklen=len(expected))
+    except (ValueError, MemoryError):
+        # Parameters scrypt refuses, e.g. n not a power of two
+        return False
+    return hmac.compare_digest(digest, expected)
+
+# Hash used to spend the same time on unknown usernames
+DUMMY_HASH = hash_password("")
+
+# Find plaintext passwords
+def find_plaintext_passwords(conn):
+    """Return (id, password) for users whose password is not a valid hash."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, password FROM users")
+        return [(user_id, password) for user_id, password in cursor.fetchall() if parse_hash(password) is None]
+    except Error as e:
+        print(f"Error reading passwords: {e}")
+        return []
+
+# Hash plaintext passwords
+def hash_plaintext_passwords(rows):
+    """Hash (id, password) rows into (hash, id) pairs ready for saving."""
+    return [(hash_password(password), user_id) for user_id, password in rows]
+
+# Save migrated password hashes
+def save_password_hashes(conn, rows):
+    """Write (hash, id) pairs back to the users table."""
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("UPDATE users SET password = ? WHERE id = ?", rows)
+        conn.commit()
+        print(f"Migrated {len(rows)} plaintext password(s).")
+    except Error as e:
+        print(f"Error migrating passwords: {e}")
+
+# Migrate plaintext passwords
+def migrate_passwords(conn):
+    """Replace any plaintext passwords in the users table with salted hashes."""
+    rows = find_plaintext_passwords(conn)
+    if rows:
+        save_password_hashes(conn, hash_plaintext_passwords(rows))
+
 # Add a new user
 def add_user(conn, username, password, name, email, role="student"):
     """Add a new user to the database."""
+    return save_user(conn, username, hash_password(password), name, email, role)
+
+# Save a new user with an already hashed password
+def save_user(conn, username, password_hash, name, email, role="student"):
+    """Insert a user whose password was hashed with hash_password."""
     try:
         cursor = conn.cursor()
         cursor.execute('''
             INSERT INTO users (username, password, name, email, role)
             VALUES (?, ?, ?, ?, ?)
-        ''', (username, password, name, email, role))
+        ''', (username, password_hash, name, email, role))
         conn.commit()
         print(f"User '{username}' added successfully.")
         return True
@@ -119,20 +239,35 @@ def add_user(conn, username, password, name, email, role="student"):
         print(f"Error adding user: {e}")
         return False
 
-# Authenticate user
-def authenticate_user(conn, username, password):
-    """Authenticate a user."""
+# Fetch login credentials
+def fetch_credentials(conn, username):
+    """Fetch the stored password hash and profile for a username."""
     try:
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT * FROM users
-            WHERE username = ? AND password = ?
-        ''', (username, password))
-        user = cursor.fetchone()
-        return user
+            SELECT id, username, name, email, role, password FROM users
+            WHERE username = ?
+        ''', (username,))
+        row = cursor.fetchone()
+        if row is None:
+            return None, DUMMY_HASH
+        return User(*row[:5]), row[5]
     except Error as e:
-        print(f"Error authenticating user: {e}")
-        return None
+        print(f"Error fetching credentials: {e}")
+        return None, DUMMY_HASH
+
+# Check a password against fetched credentials
+def check_credentials(user, stored_hash, password):
+    """Return the user if the password matches, otherwise None."""
+    if verify_password(password, stored_hash) and user is not None:
+        return user
+    return None
+
+# Authenticate user
+def authenticate_user(conn, username, password):
+    """Authenticate a user."""
+    user, stored_hash = fetch_credentials(conn, username)
+    return check_credentials(user, stored_hash, password)
 
 # CustomTkinter App
 class StudentManagementApp(ctk.CTk):
@@ -153,6 +288,19 @@ class StudentManagementApp(ctk.CTk):
         # Current user
         self.current_user = None
 
+        # Worker for slow password hashing, keeps the window responsive
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending_task = None
+        self.pending_migration = None
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # One-time upgrade of plaintext passwords, hashed on the worker
+        if self.conn is not None:
+            rows = find_plaintext_passwords(self.conn)
+            if rows:
+                self.pending_migration = self.executor.submit(hash_plaintext_passwords, rows)
+                self.after(50, self.finish_migration)
+
         # Show login screen
         self.show_login_screen()
 
@@ -170,8 +318,10 @@ class StudentManagementApp(ctk.CTk):
         self.login_password_entry = ctk.CTkEntry(self, width=300, show="*")
         self.login_password_entry.pack(pady=10)
 
-        ctk.CTkButton(self, text="Login", command=self.login).pack(pady=20)
-        ctk.CTkButton(self, text="Sign Up", command=self.show_signup_screen).pack(pady=10)
+        self.login_button = ctk.CTkButton(self, text="Login", command=self.login)
+        self.login_button.pack(pady=20)
+        self.login_signup_button = ctk.CTkButton(self, text="Sign Up", command=self.show_signup_screen)
+        self.login_signup_button.pack(pady=10)
 
     def show_signup_screen(self):
         """Display the signup screen."""
@@ -199,8 +349,10 @@ class StudentManagementApp(ctk.CTk):
         self.signup_role_entry = ctk.CTkEntry(self, width=300)
         self.signup_role_entry.pack(pady=10)
 
-        ctk.CTkButton(self, text="Sign Up", command=self.signup).pack(pady=20)
-        ctk.CTkButton(self, text="Back to Login", command=self.show_login_screen).pack(pady=10)
+        self.signup_button = ctk.CTkButton(self, text="Sign Up", command=self.signup)
+        self.signup_button.pack(pady=20)
+        self.signup_back_button = ctk.CTkButton(self, text="Back to Login", command=self.show_login_screen)
+        self.signup_back_button.pack(pady=10)
 
     def login(self):
         """Handle user login."""
@@ -211,16 +363,37 @@ class StudentManagementApp(ctk.CTk):
             messagebox.showwarning("Input Error", "Username and password are required.")
             return
 
-        user = authenticate_user(self.conn, username, password)
+        if self.pending_migration is not None:
+            messagebox.showinfo("Please Wait", "Upgrading stored passwords, please try again in a moment.")
+            return
+
+        # Query on the UI thread (sqlite connection), hash check on the worker
+        user, stored_hash = fetch_credentials(self.conn, username)
+        self.login_button.configure(state="disabled", text="Logging in...")
+        self.login_signup_button.configure(state="disabled")
+        self.run_in_background(self.finish_login, check_credentials, user, stored_hash, password)
+
+    def finish_login(self, user):
+        """Complete login once the password check has finished."""
         if user:
             self.current_user = user
-            if user[5] == "teacher":
+            if user.is_teacher:
                 self.show_teacher_dashboard()
             else:
                 self.show_student_dashboard()
         else:
+            self.login_button.configure(state="normal", text="Login")
+            self.login_signup_button.configure(state="normal")
             messagebox.showerror("Error", "Invalid username or password.")
 
+    def finish_migration(self):
+        """Save the migrated password hashes once the worker has produced them."""
+        if not self.pending_migration.done():
+            self.after(50, self.finish_migration)
+            return
+        save_password_hashes(self.conn, self.pending_migration.result())
+        self.pending_migration = None
+
     def signup(self):
         """Handle user signup."""
         username = self.signup_username_entry.get()
@@ -233,17 +406,29 @@ class StudentManagementApp(ctk.CTk):
             messagebox.showwarning("Input Error", "All fields are required.")
             return
 
-        if add_user(self.conn, username, password, name, email, role):
+        # Hash on the worker, insert on the UI thread (sqlite connection)
+        self.signup_button.configure(state="disabled", text="Signing up...")
+        self.signup_back_button.configure(state="disabled")
+        self.run_in_background(
+            lambda password_hash: self.finish_signup(username, password_hash, name, email, role),
+            hash_password, password,
+        )
+
+    def finish_signup(self, username, password_hash, name, email, role):
+        """Store the new account once its password has been hashed."""
+        if save_user(self.conn, username, password_hash, name, email, role):
             messagebox.showinfo("Success", "Account created successfully. Please login.")
             self.show_login_screen()
         else:
+            self.signup_button.configure(state="normal", text="Sign Up")
+            self.signup_back_button.configure(state="normal")
             messagebox.showerror("Error", "Failed to create account.")
 
     def show_teacher_dashboard(self):
         """Display the teacher dashboard."""
         self.clear_screen()
 
-        ctk.CTkLabel(self, text=f"Welcome, {self.current_user[3]} (Teacher)!", font=("Arial", 24)).pack(pady=20)
+        ctk.CTkLabel(self, text=f"Welcome, {self.current_user.name} (Teacher)!", font=("Arial", 24)).pack(pady=20)
 
         # Create tabs
         self.tab_view = ctk.CTkTabview(self)
@@ -288,7 +473,7 @@ class StudentManagementApp(ctk.CTk):
         """Display the student dashboard."""
         self.clear_screen()
 
-        ctk.CTkLabel(self, text=f"Welcome, {self.current_user[3]} (Student)!", font=("Arial", 24)).pack(pady=20)
+        ctk.CTkLabel(self, text=f"Welcome, {self.current_user.name} (Student)!", font=("Arial", 24)).pack(pady=20)
 
         # Create tabs
         self.tab_view = ctk.CTkTabview(self)
@@ -329,8 +514,31 @@ class StudentManagementApp(ctk.CTk):
         self.events_tab = self.tab_view.tab("Events")
         self.show_events(self.events_tab)
 
+    def run_in_background(self, on_done, func, *args):
+        """Run func on the worker and pass its result to on_done on the UI thread."""
+        future = self.executor.submit(func, *args)
+        self.pending_task = future
+        self.after(50, self.poll_task, future, on_done)
+
+    def poll_task(self, future, on_done):
+        """Wait for a background task; drop it if the screen has changed since."""
+        if future is not self.pending_task:
+            return
+        if not future.done():
+            self.after(50, self.poll_task, future, on_done)
+            return
+        self.pending_task = None
+        on_done(future.result())
+
+    def on_close(self):
+        """Shut down the hashing worker and close the window."""
+        self.executor.shutdown(wait=False)
+        self.destroy()
+
     def clear_screen(self):
         """Clear the current screen."""
+        # Results of background work started on the old screen are discarded
+        self.pending_task = None
         for widget in self.winfo_children():
             widget.destroy()
 
@@ -531,7 +739,7 @@ class StudentManagementApp(ctk.CTk):
         cursor.execute('''
             SELECT message, date FROM notifications
             WHERE user_id = ?
-        ''', (self.current_user[0],))
+        ''', (self.current_user.id,))
         records = cursor.fetchall()
 
         if not records:
@@ -561,9 +769,9 @@ class StudentManagementApp(ctk.CTk):
         """Display user profile."""
         ctk.CTkLabel(tab, text="Profile", font=("Arial", 20)).pack(pady=10)
 
-        ctk.CTkLabel(tab, text=f"Name: {self.current_user[3]}").pack()
-        ctk.CTkLabel(tab, text=f"Email: {self.current_user[4]}").pack()
-        ctk.CTkLabel(tab, text=f"Role: {self.current_user[5]}").pack()
+        ctk.CTkLabel(tab, text=f"Name: {self.current_user.name}").pack()
+        ctk.CTkLabel(tab, text=f"Email: {self.current_user.email}").pack()
+        ctk.CTkLabel(tab, text=f"Role: {self.current_user.role}").pack()
 
     def show_attendance(self, tab):
         """Display attendance as a pie chart."""
@@ -574,7 +782,7 @@ class StudentManagementApp(ctk.CTk):
         cursor.execute('''
             SELECT status FROM attendance
             WHERE user_id = ?
-        ''', (self.current_user[0],))
+        ''', (self.current_user.id,))
         records = cursor.fetchall()
 
         if not records:
@@ -602,7 +810,7 @@ class StudentManagementApp(ctk.CTk):
         cursor.execute('''
             SELECT semester, subject, marks FROM marks
             WHERE user_id = ?
-        ''', (self.current_user[0],))
+        ''', (self.current_user.id,))
         records = cursor.fetchall()
 
         if not records:
@@ -620,7 +828,7 @@ class StudentManagementApp(ctk.CTk):
         cursor.execute('''
             SELECT title, description, deadline, status FROM assignments
             WHERE user_id = ?
-        ''', (self.current_user[0],))
+        ''', (self.current_user.id,))
         records = cursor.fetchall()
 
         if not records:
@@ -638,7 +846,7 @@ class StudentManagementApp(ctk.CTk):
         cursor.execute('''
             SELECT title, description, deadline, status FROM projects
             WHERE user_id = ?
-        ''', (self.current_user[0],))
+        ''', (self.current_user.id,))
         records = cursor.fetchall()
 
         if not records:
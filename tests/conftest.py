@@ -0,0 +1,33 @@
+import importlib.util
+import os
+import sys
+import types
+
+# Make StdnMain importable from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def stub_modules(package, modules):
+    """Register empty stand-ins for a GUI package when it is not installed."""
+    if importlib.util.find_spec(package) is not None:
+        return
+    for name, attrs in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attrs)
+        sys.modules[name] = module
+
+
+# The auth functions do not need the GUI; only module-level names must resolve
+stub_modules("customtkinter", {
+    "customtkinter": {
+        "CTk": type("CTk", (), {}),
+        "set_appearance_mode": lambda mode: None,
+        "set_default_color_theme": lambda theme: None,
+    },
+})
+stub_modules("matplotlib", {
+    "matplotlib": {},
+    "matplotlib.pyplot": {},
+    "matplotlib.backends": {},
+    "matplotlib.backends.backend_tkagg": {"FigureCanvasTkAgg": object},
+})
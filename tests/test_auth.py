@@ -0,0 +1,118 @@
+import sqlite3
+
+import pytest
+
+import StdnMain
+from StdnMain import (
+    DUMMY_HASH,
+    User,
+    add_user,
+    authenticate_user,
+    create_tables,
+    fetch_credentials,
+    hash_password,
+    migrate_passwords,
+    parse_hash,
+    verify_password,
+)
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    create_tables(conn)
+    yield conn
+    conn.close()
+
+
+def insert_plaintext(conn, username, password):
+    conn.execute(
+        "INSERT INTO users (username, password, name, email, role) VALUES (?, ?, ?, ?, ?)",
+        (username, password, username.title(), f"{username}@example.com", "student"),
+    )
+    conn.commit()
+
+
+def stored_password(conn, username):
+    return conn.execute("SELECT password FROM users WHERE username = ?", (username,)).fetchone()[0]
+
+
+def test_hash_and_verify_password():
+    stored = hash_password("secret")
+    assert stored != "secret"
+    assert parse_hash(stored) is not None
+    assert verify_password("secret", stored)
+    assert not verify_password("wrong", stored)
+
+
+def test_hashes_are_salted():
+    assert hash_password("secret") != hash_password("secret")
+
+
+def test_pbkdf2_fallback(monkeypatch):
+    monkeypatch.delattr(StdnMain.hashlib, "scrypt")
+    monkeypatch.setattr(StdnMain, "PBKDF2_ITERATIONS", 1000)
+    stored = hash_password("secret")
+    assert stored.startswith("pbkdf2_sha256$1000$")
+    assert verify_password("secret", stored)
+
+
+def test_authenticate_user(conn):
+    add_user(conn, "alice", "secret", "Alice", "alice@example.com", "teacher")
+    user = authenticate_user(conn, "alice", "secret")
+    assert isinstance(user, User)
+    assert (user.username, user.name, user.email, user.role) == ("alice", "Alice", "alice@example.com", "teacher")
+    assert user.is_teacher
+    assert not hasattr(user, "__dict__")
+
+
+def test_authenticate_wrong_password(conn):
+    add_user(conn, "alice", "secret", "Alice", "alice@example.com")
+    assert authenticate_user(conn, "alice", "wrong") is None
+
+
+def test_unknown_username_gets_dummy_hash(conn):
+    assert fetch_credentials(conn, "nobody") == (None, DUMMY_HASH)
+    assert authenticate_user(conn, "nobody", "") is None
+
+
+@pytest.mark.parametrize("stored", [
+    None,
+    "",
+    "secret",
+    "scrypt$plain",
+    "scrypt$16384$8$1$abcd",
+    "scrypt$16384$8$x$abcd$abcd",
+    "scrypt$16384$8$1$zz$abcd",
+    "scrypt$16384$8$1$abcd$",
+    "scrypt$0$8$1$abcd$abcd",
+    "scrypt$1000$8$1$abcd$abcd",
+    "pbkdf2_sha256$-5$abcd$abcd",
+    "pbkdf2_sha256$1000$abcd",
+    "md5$1000$abcd$abcd",
+])
+def test_malformed_hash_is_rejected(stored):
+    assert not verify_password("secret", stored)
+
+
+def test_migrate_plaintext_passwords(conn):
+    insert_plaintext(conn, "alice", "secret")
+    insert_plaintext(conn, "bob", "scrypt$plain")
+    insert_plaintext(conn, "carol", "pbkdf2_sha256$1$ab$cd$ef")
+    add_user(conn, "dave", "hashed", "Dave", "dave@example.com")
+    dave_hash = stored_password(conn, "dave")
+
+    migrate_passwords(conn)
+
+    assert authenticate_user(conn, "alice", "secret") is not None
+    assert authenticate_user(conn, "bob", "scrypt$plain") is not None
+    assert authenticate_user(conn, "carol", "pbkdf2_sha256$1$ab$cd$ef") is not None
+    assert stored_password(conn, "dave") == dave_hash
+
+
+def test_migration_is_idempotent(conn):
+    insert_plaintext(conn, "alice", "secret")
+    migrate_passwords(conn)
+    first = stored_password(conn, "alice")
+    migrate_passwords(conn)
+    assert stored_password(conn, "alice") == first